@@ -86,7 +86,7 @@ class ModelManager:
             self.lstm_trainer = LSTMTrainer()
             lstm_path = "models/lstm_traffic_predictor.pth"
             if Path(lstm_path).exists():
-                self.lstm_trainer.load_model(lstm_path)
+                self.lstm_trainer.load_model(lstm_path, for_inference=True)
                 self.model_info['lstm'] = {
                     'loaded': True,
                     'path': lstm_path,
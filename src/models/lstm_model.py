@@ -4,14 +4,18 @@ LSTM model for traffic speed prediction using temporal patterns.
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, Subset
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from typing import Tuple, Dict, List, Optional
+import os
 import pickle
+import hashlib
+from bisect import bisect_right
 import logging
 import yaml
 from pathlib import Path
@@ -19,12 +23,21 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Checkpoints saved before attention moved to scaled_dot_product_attention
+LEGACY_ATTENTION_KEYS = {
+    'attention.in_proj_weight': 'attn_in_proj.weight',
+    'attention.in_proj_bias': 'attn_in_proj.bias',
+    'attention.out_proj.weight': 'attn_out_proj.weight',
+    'attention.out_proj.bias': 'attn_out_proj.bias',
+}
+
 class TrafficDataset(Dataset):
     """PyTorch Dataset for traffic speed prediction."""
     
     def __init__(self, sequences: np.ndarray, targets: np.ndarray):
-        self.sequences = torch.FloatTensor(sequences)
-        self.targets = torch.FloatTensor(targets)
+        # Share memory with the (already float32, contiguous) arrays instead of copying
+        self.sequences = torch.from_numpy(np.ascontiguousarray(sequences, dtype=np.float32))
+        self.targets = torch.from_numpy(np.ascontiguousarray(targets, dtype=np.float32))
     
     def __len__(self):
         return len(self.sequences)
@@ -32,6 +45,33 @@ class TrafficDataset(Dataset):
     def __getitem__(self, idx):
         return self.sequences[idx], self.targets[idx]
 
+class SegmentWindowDataset(Dataset):
+    """Sliding windows over per-segment feature blocks, sliced on access.
+    
+    Only the (rows, F) feature blocks are kept in memory instead of the full
+    (N, L, F) window array, so memory scales with rows rather than rows x L.
+    """
+    
+    def __init__(self, segments: List[Tuple[np.ndarray, np.ndarray]], sequence_length: int):
+        self.segments = segments
+        self.sequence_length = sequence_length
+        
+        # Prefix sum of window counts: segment i owns windows [offsets[i], offsets[i + 1])
+        counts = [max(len(features) - sequence_length, 0) for features, _ in segments]
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).tolist()
+    
+    def __len__(self):
+        return self.offsets[-1]
+    
+    def __getitem__(self, idx):
+        segment_idx = bisect_right(self.offsets, idx) - 1
+        start = idx - self.offsets[segment_idx]
+        features, targets = self.segments[segment_idx]
+        
+        sequence = torch.from_numpy(features[start:start + self.sequence_length])
+        target = torch.from_numpy(targets[start + self.sequence_length:start + self.sequence_length + 1])
+        return sequence, target[0]
+
 class LSTMTrafficPredictor(nn.Module):
     """LSTM model for traffic speed prediction."""
     
@@ -40,11 +80,17 @@ class LSTMTrafficPredictor(nn.Module):
                  hidden_size: int = 128,
                  num_layers: int = 2,
                  dropout: float = 0.2,
-                 output_size: int = 1):
+                 output_size: int = 1,
+                 batch_first: bool = True):
         super(LSTMTrafficPredictor, self).__init__()
         
+        # Inputs are always (B, L, F); batch_first only selects the LSTM's internal layout
+        self.batch_first = batch_first
         self.hidden_size = hidden_size
         self.num_layers = num_layers
+        self.num_heads = 8
+        self.head_dim = hidden_size // self.num_heads
+        self.drop_p = dropout
         
         # LSTM layers
         self.lstm = nn.LSTM(
@@ -52,43 +98,55 @@ class LSTMTrafficPredictor(nn.Module):
             hidden_size=hidden_size,
             num_layers=num_layers,
             dropout=dropout if num_layers > 1 else 0,
-            batch_first=True
+            batch_first=batch_first
         )
         
-        # Attention mechanism
-        self.attention = nn.MultiheadAttention(
-            embed_dim=hidden_size,
-            num_heads=8,
-            dropout=dropout,
-            batch_first=True
-        )
+        # Attention mechanism (packed q/k/v projection, same layout as nn.MultiheadAttention)
+        self.attn_in_proj = nn.Linear(hidden_size, 3 * hidden_size)
+        self.attn_out_proj = nn.Linear(hidden_size, hidden_size)
         
-        # Output layers
-        self.dropout = nn.Dropout(dropout)
+        # Output layers (dropout and ReLU are applied functionally in forward)
         self.fc1 = nn.Linear(hidden_size, hidden_size // 2)
         self.fc2 = nn.Linear(hidden_size // 2, output_size)
-        self.relu = nn.ReLU()
         
     def forward(self, x):
         batch_size = x.size(0)
-        
-        # Initialize hidden state
-        h0 = torch.zeros(self.num_layers, batch_size, self.hidden_size).to(x.device)
-        c0 = torch.zeros(self.num_layers, batch_size, self.hidden_size).to(x.device)
-        
-        # LSTM forward pass
-        lstm_out, _ = self.lstm(x, (h0, c0))
-        
-        # Apply attention
-        attn_out, _ = self.attention(lstm_out, lstm_out, lstm_out)
+        seq_len = x.size(1)
+        
+        # Keep weights in one contiguous cuDNN buffer and inputs dense for its stride check
+        if not torch.jit.is_scripting() and x.is_cuda:
+            self.lstm.flatten_parameters()
+        
+        # LSTM forward pass (nn.LSTM zero-initializes the hidden state itself),
+        # then project to per-head (B, heads, L, head_dim) q/k/v for attention
+        if self.batch_first:
+            lstm_out, _ = self.lstm(x.contiguous())
+            qkv = self.attn_in_proj(lstm_out).view(
+                batch_size, seq_len, 3, self.num_heads, self.head_dim
+            ).permute(2, 0, 3, 1, 4)
+        else:
+            # Time-major input lets oneDNN dispatch its fused RNN primitive on CPU
+            lstm_out, _ = self.lstm(x.transpose(0, 1).contiguous())
+            qkv = self.attn_in_proj(lstm_out).view(
+                seq_len, batch_size, 3, self.num_heads, self.head_dim
+            ).permute(2, 1, 3, 0, 4)
+        q, k, v = qkv.unbind(0)
+        
+        # Apply attention through the fused scaled-dot-product kernel
+        attn_out = F.scaled_dot_product_attention(
+            q, k, v, dropout_p=self.drop_p if self.training else 0.0
+        )
+        attn_out = self.attn_out_proj(
+            attn_out.transpose(1, 2).reshape(batch_size, seq_len, self.hidden_size)
+        )
         
         # Use the last output for prediction
         last_output = attn_out[:, -1, :]
         
         # Final prediction layers
-        out = self.dropout(last_output)
-        out = self.relu(self.fc1(out))
-        out = self.dropout(out)
+        out = F.dropout(last_output, p=self.drop_p, training=self.training)
+        out = F.relu(self.fc1(out), inplace=True)
+        out = F.dropout(out, p=self.drop_p, training=self.training)
         out = self.fc2(out)
         
         return out
@@ -104,7 +162,16 @@ class LSTMTrainer:
         
         self.scaler_features = StandardScaler()
         self.scaler_target = MinMaxScaler()
+        self._tgt_min = 0.0
+        self._tgt_scale = 1.0
         self.model = None
+        # Set once the model has been converted for serving and no longer holds float weights
+        self._inference_only = False
+        
+        # Lazily captured CUDA graph for single-sample predictions
+        self._inference_graph = None
+        self._in_buf = None
+        self._out_buf = None
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file."""
@@ -130,73 +197,206 @@ class LSTMTrainer:
     def prepare_data(self, data_path: str) -> Tuple[DataLoader, DataLoader, DataLoader]:
         """Prepare data for training."""
         
-        # Load processed data
-        df = pd.read_csv(data_path)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values(['segment_id', 'timestamp'])
-        
         # Feature columns
         feature_cols = ['speed_mph', 'hour', 'day_of_week', 'is_weekend', 'is_rush_hour']
         
-        # Create sequences
-        sequences = []
-        targets = []
-        
         sequence_length = self.model_config.get('sequence_length', 24)
         
-        for segment_id in df['segment_id'].unique():
-            segment_data = df[df['segment_id'] == segment_id].reset_index(drop=True)
-            
-            if len(segment_data) < sequence_length + 1:
-                continue
-                
-            for i in range(len(segment_data) - sequence_length):
-                # Features sequence
-                seq_features = segment_data.iloc[i:i+sequence_length][feature_cols].values
-                # Target (next speed)
-                target = segment_data.iloc[i+sequence_length]['speed_mph']
-                
-                sequences.append(seq_features)
-                targets.append(target)
-        
-        sequences = np.array(sequences)
-        targets = np.array(targets).reshape(-1, 1)
+        features, speeds, segment_lengths = self._load_segments(
+            data_path, feature_cols, sequence_length
+        )
         
-        logger.info(f"Created {len(sequences)} sequences of length {sequence_length}")
+        # Normalize features and targets in place
+        self._fit_transform_features(features)
+        self._fit_transform_target(speeds.reshape(-1, 1))
+        self._cache_target_inverse()
         
-        # Normalize features
-        sequences_norm = self.scaler_features.fit_transform(
-            sequences.reshape(-1, sequences.shape[-1])
-        ).reshape(sequences.shape)
+        bounds = np.cumsum(segment_lengths)[:-1]
+        dataset = SegmentWindowDataset(
+            list(zip(np.split(features, bounds), np.split(speeds, bounds))),
+            sequence_length
+        )
         
-        targets_norm = self.scaler_target.fit_transform(targets).flatten()
+        logger.info(f"Created {len(dataset)} sequences of length {sequence_length}")
         
         # Split data
-        train_size = int(0.7 * len(sequences_norm))
-        val_size = int(0.15 * len(sequences_norm))
-        
-        train_sequences = sequences_norm[:train_size]
-        train_targets = targets_norm[:train_size]
-        
-        val_sequences = sequences_norm[train_size:train_size+val_size]
-        val_targets = targets_norm[train_size:train_size+val_size]
-        
-        test_sequences = sequences_norm[train_size+val_size:]
-        test_targets = targets_norm[train_size+val_size:]
+        train_size = int(0.7 * len(dataset))
+        val_size = int(0.15 * len(dataset))
         
         # Create datasets and dataloaders
         batch_size = self.model_config.get('batch_size', 32)
         
-        train_dataset = TrafficDataset(train_sequences, train_targets)
-        val_dataset = TrafficDataset(val_sequences, val_targets)
-        test_dataset = TrafficDataset(test_sequences, test_targets)
+        train_dataset = Subset(dataset, range(train_size))
+        val_dataset = Subset(dataset, range(train_size, train_size + val_size))
+        test_dataset = Subset(dataset, range(train_size + val_size, len(dataset)))
         
-        train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
-        val_loader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False)
-        test_loader = DataLoader(test_dataset, batch_size=batch_size, shuffle=False)
+        # Pinned host memory lets the non-blocking copies in training overlap compute
+        num_workers = self.model_config.get('num_workers', 4)
+        loader_kwargs = {
+            'batch_size': batch_size,
+            'num_workers': num_workers,
+            'pin_memory': self.device.type == 'cuda'
+        }
+        if num_workers > 0:
+            loader_kwargs.update(persistent_workers=True, prefetch_factor=2)
+        
+        # Fixed-size training batches keep compiled CUDA graphs replayable
+        train_loader = DataLoader(
+            train_dataset, shuffle=True,
+            drop_last=len(train_dataset) > batch_size, **loader_kwargs
+        )
+        val_loader = DataLoader(val_dataset, shuffle=False, **loader_kwargs)
+        test_loader = DataLoader(test_dataset, shuffle=False, **loader_kwargs)
         
         return train_loader, val_loader, test_loader
     
+    def _autocast(self, cache_enabled: bool = True) -> torch.autocast:
+        """Mixed-precision context for forward passes.
+        
+        FP16 is the default because cuDNN only selects its persistent LSTM kernels
+        for half precision; ``amp_dtype: bfloat16`` opts into BF16 where supported.
+        """
+        enabled = self.device.type == 'cuda' and self.model_config.get('mixed_precision', True)
+        dtype = torch.bfloat16
+        if enabled and (self.model_config.get('amp_dtype', 'float16') != 'bfloat16'
+                        or not torch.cuda.is_bf16_supported()):
+            dtype = torch.float16
+        return torch.autocast(
+            device_type=self.device.type, dtype=dtype,
+            enabled=enabled, cache_enabled=cache_enabled
+        )
+    
+    def _lstm_batch_first(self) -> bool:
+        """Internal LSTM layout: time-major on CPU when ``time_major_on_cpu`` is set.
+        
+        oneDNN's fused LSTM prefers (L, B, F) input; cuDNN is fastest batch-first,
+        and builds without oneDNN RNN support see no gain, so CPU opts in explicitly.
+        """
+        return not (self.device.type == 'cpu' and self.model_config.get('time_major_on_cpu', False))
+    
+    def _compile_model(self, model: nn.Module) -> nn.Module:
+        """Compile the model on CUDA to fuse the attention/MLP tail and cut launch overhead."""
+        if self.device.type != 'cuda' or not self.model_config.get('compile', True):
+            return model
+        
+        # cuDNN LSTM forces a graph break, so the full graph cannot be captured
+        return torch.compile(model, mode='reduce-overhead', fullgraph=False, dynamic=False)
+    
+    @staticmethod
+    def _upgrade_state_dict(state_dict: Dict) -> Dict:
+        """Rename nn.MultiheadAttention weights from older checkpoints to the packed projections."""
+        return {LEGACY_ATTENTION_KEYS.get(key, key): value for key, value in state_dict.items()}
+    
+    def _unwrap_model(self) -> nn.Module:
+        """Return the underlying module so state dicts never carry compile prefixes."""
+        return getattr(self.model, '_orig_mod', self.model)
+    
+    def _segment_cache_paths(self,
+                             data_path: str,
+                             feature_cols: List[str],
+                             sequence_length: int) -> Tuple[Path, Path, Path]:
+        """Cache file paths keyed on the source file version and windowing parameters."""
+        source = Path(data_path).resolve()
+        stat = source.stat()
+        key = hashlib.sha1(
+            repr((str(source), stat.st_mtime_ns, stat.st_size, sequence_length, feature_cols)).encode()
+        ).hexdigest()[:16]
+        
+        cache_dir = Path(self.model_config.get('cache_dir', 'data/processed/sequence_cache'))
+        return (cache_dir / f"{key}_features.npy",
+                cache_dir / f"{key}_speeds.npy",
+                cache_dir / f"{key}_lengths.npy")
+    
+    def _load_segments(self,
+                       data_path: str,
+                       feature_cols: List[str],
+                       sequence_length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Load (rows, F) features, (rows,) speeds and per-segment row counts, reusing the disk cache.
+        
+        Rows are grouped by segment in timestamp order; only segments long enough
+        to yield at least one window are kept.
+        """
+        cache_paths = self._segment_cache_paths(data_path, feature_cols, sequence_length)
+        if all(path.exists() for path in cache_paths):
+            logger.info(f"Loading cached segments from {cache_paths[0].parent}")
+            # Copy-on-write mapping: in-place normalization never writes back to the cache
+            features, speeds, segment_lengths = (np.load(path, mmap_mode='c') for path in cache_paths)
+            return features, speeds, segment_lengths
+        
+        # Load processed data with Arrow's multithreaded CSV parser
+        df = pacsv.read_csv(
+            data_path,
+            convert_options=pacsv.ConvertOptions(column_types={'timestamp': pa.timestamp('ns')})
+        ).to_pandas()
+        df = df.sort_values(['segment_id', 'timestamp'])
+        
+        segment_sizes = df.groupby('segment_id', sort=False, observed=True)['segment_id'].transform('size')
+        df = df[segment_sizes.to_numpy() >= sequence_length + 1]
+        
+        features = df[feature_cols].to_numpy(dtype=np.float32)
+        speeds = df['speed_mph'].to_numpy(dtype=np.float32)
+        segment_lengths = df.groupby('segment_id', sort=False, observed=True).size().to_numpy()
+        
+        cache_paths[0].parent.mkdir(parents=True, exist_ok=True)
+        # Each file is written beside its final path and renamed into place, lengths
+        # last, so an interrupted run never leaves a truncated set that looks complete
+        for path, array in zip(cache_paths, (features, speeds, segment_lengths)):
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        
+        return features, speeds, segment_lengths
+    
+    def _fit_transform_features(self, sequences: np.ndarray) -> np.ndarray:
+        """Fit the feature scaler on (..., F) features and standardize them in place.
+        
+        The fitted attributes are written onto the sklearn ``StandardScaler`` so
+        ``predict`` and saved checkpoints keep using its ``transform`` API.
+        """
+        flat = sequences.reshape(-1, sequences.shape[-1])
+        mean = flat.mean(axis=0, dtype=np.float64)
+        var = flat.var(axis=0, dtype=np.float64)
+        scale = np.sqrt(var)
+        scale[scale == 0.0] = 1.0
+        
+        np.subtract(sequences, mean.astype(sequences.dtype), out=sequences)
+        np.divide(sequences, scale.astype(sequences.dtype), out=sequences)
+        
+        self.scaler_features.mean_ = mean
+        self.scaler_features.var_ = var
+        self.scaler_features.scale_ = scale
+        self.scaler_features.n_features_in_ = flat.shape[1]
+        self.scaler_features.n_samples_seen_ = flat.shape[0]
+        
+        return sequences
+    
+    def _fit_transform_target(self, targets: np.ndarray) -> np.ndarray:
+        """Fit the target scaler on (N, 1) targets and min-max scale them in place."""
+        data_min = targets.min(axis=0).astype(np.float64)
+        data_max = targets.max(axis=0).astype(np.float64)
+        data_range = data_max - data_min
+        scale = 1.0 / np.where(data_range == 0.0, 1.0, data_range)
+        min_ = -data_min * scale
+        
+        np.multiply(targets, scale.astype(targets.dtype), out=targets)
+        np.add(targets, min_.astype(targets.dtype), out=targets)
+        
+        self.scaler_target.data_min_ = data_min
+        self.scaler_target.data_max_ = data_max
+        self.scaler_target.data_range_ = data_range
+        self.scaler_target.scale_ = scale
+        self.scaler_target.min_ = min_
+        self.scaler_target.n_features_in_ = targets.shape[1]
+        self.scaler_target.n_samples_seen_ = targets.shape[0]
+        
+        return targets
+    
+    def _cache_target_inverse(self):
+        """Cache the fitted target scaler's inverse as plain floats: y = y_norm * scale + min."""
+        self._tgt_min = float(self.scaler_target.data_min_[0])
+        self._tgt_scale = float(1.0 / self.scaler_target.scale_[0])
+    
     def train_model(self, train_loader: DataLoader, val_loader: DataLoader):
         """Train the LSTM model."""
         
@@ -206,18 +406,27 @@ class LSTMTrainer:
             input_size=input_size,
             hidden_size=self.model_config.get('hidden_size', 128),
             num_layers=self.model_config.get('num_layers', 2),
-            dropout=self.model_config.get('dropout', 0.2)
+            dropout=self.model_config.get('dropout', 0.2),
+            batch_first=self._lstm_batch_first()
         ).to(self.device)
+        self.model = self._compile_model(self.model)
+        self._inference_only = False
+        self._inference_graph = None
         
         # Loss and optimizer
         criterion = nn.MSELoss()
+        # Fused Adam updates all parameters in one kernel on CUDA; foreach batches them on CPU
+        fused = self.device.type == 'cuda'
         optimizer = optim.Adam(
             self.model.parameters(),
-            lr=self.model_config.get('learning_rate', 0.001)
+            lr=self.model_config.get('learning_rate', 0.001),
+            fused=fused,
+            foreach=not fused
         )
         scheduler = optim.lr_scheduler.ReduceLROnPlateau(
             optimizer, mode='min', factor=0.5, patience=10
         )
+        scaler = torch.cuda.amp.GradScaler(enabled=self.device.type == 'cuda')
         
         epochs = self.model_config.get('epochs', 100)
         best_val_loss = float('inf')
@@ -232,38 +441,43 @@ class LSTMTrainer:
         for epoch in range(epochs):
             # Training
             self.model.train()
-            train_loss = 0.0
+            # Accumulate losses on device so the loop never syncs with the host
+            running_train = torch.zeros((), device=self.device)
             
             for batch_sequences, batch_targets in train_loader:
-                batch_sequences = batch_sequences.to(self.device)
-                batch_targets = batch_targets.to(self.device)
+                batch_sequences = batch_sequences.to(self.device, non_blocking=True)
+                batch_targets = batch_targets.to(self.device, non_blocking=True)
                 
-                optimizer.zero_grad()
-                outputs = self.model(batch_sequences)
-                loss = criterion(outputs.squeeze(), batch_targets)
-                loss.backward()
+                optimizer.zero_grad(set_to_none=True)
+                with self._autocast():
+                    outputs = self.model(batch_sequences)
+                    loss = criterion(outputs.view(-1), batch_targets.view(-1))
+                scaler.scale(loss).backward()
                 
-                # Gradient clipping
+                # Gradient clipping (on unscaled gradients)
+                scaler.unscale_(optimizer)
                 torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
                 
-                optimizer.step()
-                train_loss += loss.item()
+                scaler.step(optimizer)
+                scaler.update()
+                running_train += loss.detach()
             
             # Validation
             self.model.eval()
-            val_loss = 0.0
+            running_val = torch.zeros((), device=self.device)
             
             with torch.no_grad():
                 for batch_sequences, batch_targets in val_loader:
-                    batch_sequences = batch_sequences.to(self.device)
-                    batch_targets = batch_targets.to(self.device)
+                    batch_sequences = batch_sequences.to(self.device, non_blocking=True)
+                    batch_targets = batch_targets.to(self.device, non_blocking=True)
                     
-                    outputs = self.model(batch_sequences)
-                    loss = criterion(outputs.squeeze(), batch_targets)
-                    val_loss += loss.item()
+                    with self._autocast():
+                        outputs = self.model(batch_sequences)
+                        loss = criterion(outputs.view(-1), batch_targets.view(-1))
+                    running_val += loss.detach()
             
-            train_loss /= len(train_loader)
-            val_loss /= len(val_loader)
+            train_loss = (running_train / len(train_loader)).item()
+            val_loss = (running_val / len(val_loader)).item()
             
             train_losses.append(train_loss)
             val_losses.append(val_loss)
@@ -278,7 +492,7 @@ class LSTMTrainer:
                 best_val_loss = val_loss
                 patience_counter = 0
                 # Save best model
-                torch.save(self.model.state_dict(), 'models/best_lstm_model.pth')
+                torch.save(self._unwrap_model().state_dict(), 'models/best_lstm_model.pth')
             else:
                 patience_counter += 1
                 
@@ -296,37 +510,46 @@ class LSTMTrainer:
             raise ValueError("Model not trained yet")
         
         self.model.eval()
-        predictions = []
-        actuals = []
         
-        with torch.no_grad():
+        # Accumulate on device and copy back to the host once
+        num_samples = len(test_loader.dataset)
+        preds = torch.empty(num_samples, device=self.device)
+        acts = torch.empty(num_samples, device=self.device)
+        offset = 0
+        
+        with torch.inference_mode():
             for batch_sequences, batch_targets in test_loader:
-                batch_sequences = batch_sequences.to(self.device)
-                outputs = self.model(batch_sequences)
+                batch_sequences = batch_sequences.to(self.device, non_blocking=True)
+                with self._autocast():
+                    outputs = self.model(batch_sequences)
                 
-                predictions.extend(outputs.cpu().numpy().flatten())
-                actuals.extend(batch_targets.numpy())
-        
-        # Denormalize predictions and actuals
-        predictions = np.array(predictions).reshape(-1, 1)
-        actuals = np.array(actuals).reshape(-1, 1)
-        
-        predictions_denorm = self.scaler_target.inverse_transform(predictions).flatten()
-        actuals_denorm = self.scaler_target.inverse_transform(actuals).flatten()
-        
-        # Calculate metrics
-        mae = mean_absolute_error(actuals_denorm, predictions_denorm)
-        mse = mean_squared_error(actuals_denorm, predictions_denorm)
-        rmse = np.sqrt(mse)
-        r2 = r2_score(actuals_denorm, predictions_denorm)
+                batch_len = batch_targets.size(0)
+                preds[offset:offset + batch_len] = outputs.view(-1)
+                acts[offset:offset + batch_len] = batch_targets.to(self.device, non_blocking=True)
+                offset += batch_len
+        
+        # Denormalize predictions and actuals (MinMaxScaler inverse is a single affine map)
+        preds = preds * self._tgt_scale + self._tgt_min
+        acts = acts * self._tgt_scale + self._tgt_min
+        
+        # Calculate metrics with on-device reductions
+        errors = preds - acts
+        mae = errors.abs().mean()
+        mse = errors.pow(2).mean()
+        rmse = mse.sqrt()
+        ss_res = errors.pow(2).sum()
+        ss_tot = (acts - acts.mean()).pow(2).sum()
+        r2 = 1 - ss_res / ss_tot
+        
+        mae, mse, rmse, r2 = torch.stack([mae, mse, rmse, r2]).tolist()
         
         metrics = {
             'mae': mae,
             'mse': mse,
             'rmse': rmse,
             'r2': r2,
-            'predictions': predictions_denorm,
-            'actuals': actuals_denorm
+            'predictions': preds.cpu().numpy(),
+            'actuals': acts.cpu().numpy()
         }
         
         logger.info(f"Evaluation Metrics - MAE: {mae:.2f}, RMSE: {rmse:.2f}, R²: {r2:.4f}")
@@ -335,10 +558,15 @@ class LSTMTrainer:
     
     def save_model(self, model_path: str = "models/lstm_traffic_predictor.pth"):
         """Save the trained model and scalers."""
+        if self._inference_only:
+            raise ValueError(
+                "Model was quantized or frozen for inference and no longer holds the float weights; "
+                "reload it without for_inference=True to save it"
+            )
         Path(model_path).parent.mkdir(parents=True, exist_ok=True)
         
         torch.save({
-            'model_state_dict': self.model.state_dict(),
+            'model_state_dict': self._unwrap_model().state_dict(),
             'model_config': self.model_config,
             'scaler_features': self.scaler_features,
             'scaler_target': self.scaler_target
@@ -346,27 +574,94 @@ class LSTMTrainer:
         
         logger.info(f"Model saved to {model_path}")
     
-    def load_model(self, model_path: str):
-        """Load a trained model."""
+    def load_model(self, model_path: str, for_inference: bool = False):
+        """Load a trained model.
+        
+        With for_inference=True on CPU the model is additionally quantized to int8
+        and frozen as TorchScript for serving; such a model can no longer be
+        trained or saved.
+        """
         checkpoint = torch.load(model_path, map_location=self.device)
         
         self.model_config = checkpoint['model_config']
         self.scaler_features = checkpoint['scaler_features']
         self.scaler_target = checkpoint['scaler_target']
+        self._cache_target_inverse()
         
         input_size = 5
         self.model = LSTMTrafficPredictor(
             input_size=input_size,
             hidden_size=self.model_config.get('hidden_size', 128),
             num_layers=self.model_config.get('num_layers', 2),
-            dropout=self.model_config.get('dropout', 0.2)
+            dropout=self.model_config.get('dropout', 0.2),
+            batch_first=self._lstm_batch_first()
         ).to(self.device)
         
-        self.model.load_state_dict(checkpoint['model_state_dict'])
+        self.model.load_state_dict(self._upgrade_state_dict(checkpoint['model_state_dict']))
         self.model.eval()
+        self._inference_only = False
+        if for_inference and self.device.type == 'cpu':
+            self.quantize_for_inference()
+            self._script_for_inference(input_size)
+        self.model = self._compile_model(self.model)
+        self._inference_graph = None
         
         logger.info(f"Model loaded from {model_path}")
     
+    def quantize_for_inference(self):
+        """Swap LSTM and Linear layers for dynamic int8 versions for CPU serving.
+        
+        Weights are quantized once; activations are quantized per call, so no
+        calibration data is needed. The quantized model cannot be trained further.
+        """
+        if self.model is None:
+            raise ValueError("Model not loaded")
+        
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {nn.LSTM, nn.Linear}, dtype=torch.qint8
+        )
+        self._inference_only = True
+        self._inference_graph = None
+        logger.info("Model dynamically quantized to int8")
+    
+    def _script_for_inference(self, input_size: int):
+        """Script, freeze and optimize the model for CPU serving, then warm it up.
+        
+        The first calls of a scripted module run the profiling executor, so two
+        warm-up passes keep that cost out of the first real request.
+        """
+        self.model = torch.jit.optimize_for_inference(torch.jit.script(self.model.eval()))
+        # Freezing inlines the parameters, so the state dict no longer matches the architecture
+        self._inference_only = True
+        
+        warmup = torch.zeros(1, self.model_config.get('sequence_length', 24), input_size)
+        with torch.inference_mode():
+            for _ in range(2):
+                self.model(warmup)
+    
+    def _replay_inference_graph(self, sequence_tensor: torch.Tensor) -> torch.Tensor:
+        """Run the model through a CUDA graph captured for the fixed (1, L, F) input shape."""
+        if self._inference_graph is None or self._in_buf.shape != sequence_tensor.shape:
+            self._in_buf = torch.empty_like(sequence_tensor)
+            self._in_buf.copy_(sequence_tensor)
+            
+            # Warm up on a side stream so capture sees initialized cuDNN/cuBLAS state
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    self.model(self._in_buf)
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                self._out_buf = self.model(self._in_buf)
+            self._inference_graph = graph
+        
+        self._in_buf.copy_(sequence_tensor)
+        self._inference_graph.replay()
+        return self._out_buf
+    
     def predict(self, sequence: np.ndarray) -> float:
         """Make a single prediction."""
         if self.model is None:
@@ -380,13 +675,15 @@ class LSTMTrainer:
         sequence_tensor = torch.FloatTensor(sequence_norm).to(self.device)
         
         # Predict
-        with torch.no_grad():
-            prediction = self.model(sequence_tensor)
-            prediction_denorm = self.scaler_target.inverse_transform(
-                prediction.cpu().numpy().reshape(-1, 1)
-            )
+        # Autocast caching must stay off while a CUDA graph is being captured
+        with torch.inference_mode(), self._autocast(cache_enabled=False):
+            if self.device.type == 'cuda' and self._unwrap_model() is self.model:
+                prediction = self._replay_inference_graph(sequence_tensor)
+            else:
+                prediction = self.model(sequence_tensor)
+            prediction_denorm = prediction.float().item() * self._tgt_scale + self._tgt_min
         
-        return prediction_denorm[0, 0]
+        return prediction_denorm
 
 def main():
     """Main function to train and evaluate LSTM model."""
@@ -2,22 +2,113 @@
 Interactive map visualizations for traffic speed data using Folium and KeplerGL.
 """
 
-import folium
-from folium import plugins
 import pandas as pd
 import numpy as np
 import json
+import functools
+import hashlib
+import importlib.util
+import io
+import os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import logging
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _lazy_plotly():
+    """Import plotly on first use; returns (go, make_subplots)."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    return go, make_subplots
+
+@functools.lru_cache(maxsize=None)
+def _pydeck_available() -> bool:
+    """Whether pydeck is installed, checked without importing its widget stack.
+    
+    Optional: without it large segment maps fall back to Leaflet's canvas renderer.
+    """
+    return importlib.util.find_spec("pydeck") is not None
+
+def dumps_json(obj) -> str:
+    """Serialize to JSON text, using orjson (numpy-aware) when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj)
+
+# Speed buckets (mph) shared by all map builders: <15, 15-25, 25-35, >=35
+SPEED_BUCKET_EDGES = np.array([15, 25, 35], dtype=np.float32)
+HEX_COLORS = np.array(['#FF0000', '#FF8C00', '#FFD700', '#32CD32'])  # Red, orange, gold, green
+NAMED_COLORS = np.array(['red', 'orange', 'yellow', 'green'])
+RGBA_COLORS = np.array([[255, 0, 0, 200], [255, 165, 0, 200], [255, 255, 0, 200], [0, 128, 0, 200]])
+
+# Rush hour periods in display order
+RUSH_HOUR_PERIODS = ['Morning Rush', 'Evening Rush', 'Off Peak']
+
+# Above this many features Leaflet's SVG renderer (one DOM node per line) bogs down
+LARGE_MAP_FEATURES = 5000
+
+# Part of every render cache key; bump whenever a builder's HTML output changes
+RENDER_CACHE_VERSION = "1"
+
+def bucket_speeds(speeds: np.ndarray) -> np.ndarray:
+    """Map speeds to bucket indices into HEX_COLORS / NAMED_COLORS (NaN falls in the top bucket)."""
+    return np.digitize(speeds, SPEED_BUCKET_EDGES).astype(np.int8)
+
+def segment_speed_labels(segment_ids: np.ndarray, speeds: np.ndarray) -> List[str]:
+    """Format "Segment <id>: <speed> mph" labels column-wise rather than per row."""
+    return ('Segment ' + pd.Series(segment_ids).astype(str) + ': ' +
+            pd.Series(speeds).map('{:.1f}'.format) + ' mph').tolist()
+
+COORDINATE_COLUMNS = ['start_lat', 'start_lon', 'end_lat', 'end_lon']
+
+def compact_coordinates(data: pd.DataFrame, downcast: bool = False) -> pd.DataFrame:
+    """Round coordinates to 6 decimals (~0.1 m), the precision Leaflet renders.
+
+    Rounded float64 values keep short JSON reprs when folium serializes them.
+    With ``downcast`` the coordinates and speed are also stored as float32, which
+    only pays off for writers that format numpy values directly (KeplerGL's CSV).
+    """
+    columns = [c for c in COORDINATE_COLUMNS if c in data.columns]
+    compacted = {c: data[c].round(6) for c in columns}
+    if downcast:
+        if 'speed_mph' in data.columns:
+            columns.append('speed_mph')
+            compacted['speed_mph'] = data['speed_mph']
+        compacted = {c: compacted[c].astype(np.float32, copy=False) for c in columns}
+    return data.assign(**compacted) if compacted else data
+
+def index_segments(segments_data: pd.DataFrame) -> pd.DataFrame:
+    """Index segment metadata by segment_id once so every builder can join() against it."""
+    if segments_data.index.name == 'segment_id':
+        return segments_data
+    return segments_data.set_index('segment_id')
+
+def join_segments(data: pd.DataFrame, segments_data: pd.DataFrame) -> pd.DataFrame:
+    """Left-join segment metadata onto rows by segment_id (same result as merge(how='left'))."""
+    return data.join(index_segments(segments_data), on='segment_id', how='left',
+                     lsuffix='_x', rsuffix='_y')
+
+def drop_degenerate_segments(data: pd.DataFrame) -> pd.DataFrame:
+    """Drop segments whose start and end coincide; they draw nothing at any zoom."""
+    has_extent = ((data['start_lat'].to_numpy() != data['end_lat'].to_numpy()) |
+                  (data['start_lon'].to_numpy() != data['end_lon'].to_numpy()))
+    return data if has_extent.all() else data[has_extent]
+
+def _render(func, *args):
+    """Run an output writer in a worker process, discarding its return value."""
+    func(*args)
+
 class TrafficMapVisualizer:
     """Create interactive maps for traffic speed visualization."""
     
@@ -28,11 +119,55 @@ class TrafficMapVisualizer:
         self.center_lat = center_lat
         self.center_lon = center_lon
         self.zoom_start = zoom_start
+    
+    def _cache_key(self, method_name: str, *frames: pd.DataFrame, extra: str = "") -> str:
+        """Hash the input frames, map settings, method name and renderer version into a cache key."""
+        digest = hashlib.blake2b()
+        # Output also depends on the rendering code and on which backend is installed
+        digest.update(f"{RENDER_CACHE_VERSION},pydeck={_pydeck_available()}".encode())
+        for frame in frames:
+            digest.update(pd.util.hash_pandas_object(
+                frame, index=frame.index.name is not None).values.tobytes())
+            digest.update(",".join(map(str, frame.columns)).encode())
+        digest.update(f"{self.center_lat},{self.center_lon},{self.zoom_start},{extra}".encode())
+        digest.update(method_name.encode())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _cache_sidecar(output_path: str) -> Path:
+        """Path of the .cache_key file stored beside an HTML output."""
+        return Path(f"{output_path}.cache_key")
+    
+    def _is_cached(self, output_path: str, key: str) -> bool:
+        """Check whether the HTML on disk was rendered from the same inputs."""
+        sidecar = self._cache_sidecar(output_path)
+        return (Path(output_path).exists() and sidecar.exists()
+                and sidecar.read_text().strip() == key)
+    
+    def _store_cache_key(self, output_path: str, key: Optional[str]):
+        """Record the cache key for a freshly rendered HTML output; no-op without a key."""
+        if key is not None:
+            self._cache_sidecar(output_path).write_text(key)
         
     def create_speed_heatmap(self, 
                            traffic_data: pd.DataFrame,
-                           output_path: str = "traffic_heatmap.html"):
-        """Create a heatmap showing traffic speeds across the city."""
+                           output_path: str = "traffic_heatmap.html",
+                           skip_if_cached: bool = False):
+        """Create a heatmap showing traffic speeds across the city.
+        
+        With skip_if_cached, returns None without rendering when output_path was
+        already rendered from identical inputs.
+        """
+        
+        cache_key = None
+        if skip_if_cached:
+            cache_key = self._cache_key("create_speed_heatmap", traffic_data)
+            if self._is_cached(output_path, cache_key):
+                logger.info(f"{output_path} is up to date, skipping render")
+                return None
+        
+        import folium
+        from folium import plugins
         
         # Create base map
         m = folium.Map(
@@ -41,17 +176,15 @@ class TrafficMapVisualizer:
             tiles='OpenStreetMap'
         )
         
-        # Prepare data for heatmap
-        heat_data = []
-        for _, row in traffic_data.iterrows():
-            # Use start coordinates and speed for heatmap
-            lat = row['start_lat']
-            lon = row['start_lon']
-            speed = row['speed_mph']
-            
-            # Normalize speed to 0-1 for heatmap intensity
-            intensity = speed / 60.0  # Assuming max speed of 60 mph
-            heat_data.append([lat, lon, intensity])
+        traffic_data = compact_coordinates(traffic_data)
+        
+        # Prepare data for heatmap: [lat, lon, intensity] rows from start coordinates
+        heat_array = np.empty((len(traffic_data), 3), dtype=np.float64)
+        heat_array[:, 0] = traffic_data['start_lat'].to_numpy()
+        heat_array[:, 1] = traffic_data['start_lon'].to_numpy()
+        # Normalize speed to 0-1 for heatmap intensity (assuming max speed of 60 mph)
+        heat_array[:, 2] = traffic_data['speed_mph'].to_numpy() / 60.0
+        heat_data = heat_array.tolist()
         
         # Add heatmap layer
         if heat_data:
@@ -68,6 +201,7 @@ class TrafficMapVisualizer:
         
         # Save map
         m.save(output_path)
+        self._store_cache_key(output_path, cache_key)
         logger.info(f"Speed heatmap saved to {output_path}")
         
         return m
@@ -76,15 +210,22 @@ class TrafficMapVisualizer:
                           traffic_data: pd.DataFrame,
                           segments_data: pd.DataFrame,
                           timestamp: Optional[str] = None,
-                          output_path: str = "segment_map.html"):
-        """Create a map showing individual road segments colored by speed."""
+                          output_path: str = "segment_map.html",
+                          skip_if_cached: bool = False):
+        """Create a map showing individual road segments colored by speed.
         
-        # Create base map
-        m = folium.Map(
-            location=[self.center_lat, self.center_lon],
-            zoom_start=self.zoom_start,
-            tiles='CartoDB positron'
-        )
+        With skip_if_cached, returns None without rendering when output_path was
+        already rendered from identical inputs.
+        """
+        
+        cache_key = None
+        if skip_if_cached:
+            cache_key = self._cache_key("create_segment_map", traffic_data, segments_data, extra=str(timestamp))
+            if self._is_cached(output_path, cache_key):
+                logger.info(f"{output_path} is up to date, skipping render")
+                return None
+        
+        import folium
         
         # Filter data for specific timestamp if provided
         if timestamp:
@@ -94,37 +235,71 @@ class TrafficMapVisualizer:
             traffic_data = traffic_data[traffic_data['timestamp'] == traffic_data['timestamp'].max()]
         
         # Merge with segments data
-        merged_data = traffic_data.merge(segments_data, on='segment_id', how='left')
-        
-        # Define color mapping for speeds
-        def get_color(speed):
-            if speed < 15:
-                return 'red'
-            elif speed < 25:
-                return 'orange'
-            elif speed < 35:
-                return 'yellow'
-            else:
-                return 'green'
-        
-        # Add segments to map
-        for _, row in merged_data.iterrows():
-            if pd.notna(row['start_lat']) and pd.notna(row['end_lat']):
-                # Create line for segment
-                line = folium.PolyLine(
-                    locations=[[row['start_lat'], row['start_lon']], 
-                              [row['end_lat'], row['end_lon']]],
-                    weight=5,
-                    color=get_color(row['speed_mph']),
-                    opacity=0.8,
-                    popup=folium.Popup(
-                        f"Segment {row['segment_id']}<br>"
-                        f"Speed: {row['speed_mph']:.1f} mph<br>"
-                        f"Time: {row.get('timestamp', 'N/A')}",
-                        max_width=200
-                    )
-                )
-                line.add_to(m)
+        merged_data = join_segments(traffic_data, segments_data)
+        
+        # Drop segments without coordinates once, then bucket speeds into colors
+        merged_data = drop_degenerate_segments(
+            compact_coordinates(merged_data.dropna(subset=['start_lat', 'end_lat']))
+        )
+        speed_buckets = bucket_speeds(merged_data['speed_mph'].to_numpy())
+        
+        # Large maps render as a single WebGL layer when pydeck is installed
+        large_map = len(merged_data) > LARGE_MAP_FEATURES
+        if large_map and _pydeck_available():
+            deck = self._create_segment_deck(merged_data, speed_buckets)
+            deck.to_html(output_path, open_browser=False, notebook_display=False)
+            self._store_cache_key(output_path, cache_key)
+            logger.info(f"Segment map saved to {output_path} (pydeck, {len(merged_data)} segments)")
+            return deck
+        
+        # Create base map; large maps draw onto one canvas instead of per-line SVG nodes
+        m = folium.Map(
+            location=[self.center_lat, self.center_lon],
+            zoom_start=self.zoom_start,
+            tiles='CartoDB positron',
+            prefer_canvas=large_map
+        )
+        # Add all segments as one GeoJSON layer rather than a PolyLine script per segment
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": [[start_lon, start_lat], [end_lon, end_lat]]
+                },
+                "properties": {
+                    "segment_id": segment_id,
+                    "speed": speed,
+                    "time": time,
+                    "color": color
+                }
+            }
+            for start_lat, start_lon, end_lat, end_lon, segment_id, speed, time, color in zip(
+                merged_data['start_lat'].tolist(),
+                merged_data['start_lon'].tolist(),
+                merged_data['end_lat'].tolist(),
+                merged_data['end_lon'].tolist(),
+                merged_data['segment_id'].tolist(),
+                merged_data['speed_mph'].round(1).tolist(),
+                merged_data['timestamp'].astype(str).tolist(),
+                NAMED_COLORS[speed_buckets].tolist()
+            )
+        ]
+        
+        if features:
+            fields = ['segment_id', 'speed', 'time']
+            aliases = ['Segment', 'Speed (mph)', 'Time']
+            folium.GeoJson(
+                {"type": "FeatureCollection", "features": features},
+                name='Segments',
+                style_function=lambda feature: {
+                    'color': feature['properties']['color'],
+                    'weight': 5,
+                    'opacity': 0.8
+                },
+                tooltip=folium.GeoJsonTooltip(fields=fields, aliases=aliases),
+                popup=folium.GeoJsonPopup(fields=fields, aliases=aliases, max_width=200)
+            ).add_to(m)
         
         # Add legend
         legend_html = '''
@@ -143,93 +318,170 @@ class TrafficMapVisualizer:
         
         # Save map
         m.save(output_path)
+        self._store_cache_key(output_path, cache_key)
         logger.info(f"Segment map saved to {output_path}")
         
         return m
     
+    def _create_segment_deck(self, merged_data: pd.DataFrame, speed_buckets: np.ndarray):
+        """Build a pydeck PathLayer map for segment counts Leaflet cannot draw smoothly."""
+        import pydeck as pdk
+        
+        paths = np.stack([
+            merged_data[['start_lon', 'start_lat']].to_numpy(),
+            merged_data[['end_lon', 'end_lat']].to_numpy()
+        ], axis=1)
+        deck_data = pd.DataFrame({
+            'segment_id': merged_data['segment_id'].to_numpy(),
+            'speed_mph': merged_data['speed_mph'].round(1).to_numpy(),
+            'timestamp': merged_data['timestamp'].astype(str).to_numpy(),
+            'path': paths.tolist(),
+            'color': RGBA_COLORS[speed_buckets].tolist()
+        })
+        
+        layer = pdk.Layer(
+            'PathLayer',
+            deck_data,
+            get_path='path',
+            get_color='color',
+            width_scale=5,
+            width_min_pixels=2,
+            pickable=True
+        )
+        view_state = pdk.ViewState(
+            latitude=self.center_lat,
+            longitude=self.center_lon,
+            zoom=self.zoom_start
+        )
+        return pdk.Deck(
+            layers=[layer],
+            initial_view_state=view_state,
+            map_style='light',
+            tooltip={"text": "Segment {segment_id}\nSpeed: {speed_mph} mph\nTime: {timestamp}"}
+        )
+    
     def create_time_series_animation(self, 
                                    traffic_data: pd.DataFrame,
                                    segments_data: pd.DataFrame,
-                                   output_path: str = "traffic_animation.html"):
-        """Create an animated map showing traffic changes over time."""
+                                   output_path: str = "traffic_animation.html",
+                                   skip_if_cached: bool = False):
+        """Create an animated map showing traffic changes over time.
+        
+        With skip_if_cached, returns None without rendering when output_path was
+        already rendered from identical inputs.
+        """
+        
+        cache_key = None
+        if skip_if_cached:
+            cache_key = self._cache_key("create_time_series_animation", traffic_data, segments_data)
+            if self._is_cached(output_path, cache_key):
+                logger.info(f"{output_path} is up to date, skipping render")
+                return None
+        
+        import folium
+        from folium import plugins
         
         # Ensure timestamp is datetime
         traffic_data['timestamp'] = pd.to_datetime(traffic_data['timestamp'])
         
         # Merge with segments data
-        merged_data = traffic_data.merge(segments_data, on='segment_id', how='left')
+        merged_data = join_segments(traffic_data, segments_data)
         
-        # Group by timestamp
-        timestamps = sorted(merged_data['timestamp'].unique())
+        # Prepare data for time animation: each feature carries its own timestamp,
+        # so one vectorized pass over rows in time order replaces the per-timestamp scan
+        merged_data = drop_degenerate_segments(
+            compact_coordinates(merged_data.dropna(subset=['start_lat', 'end_lat']))
+        )
         
-        # Create base map
+        # Create base map; large animations draw onto one canvas instead of SVG nodes
         m = folium.Map(
             location=[self.center_lat, self.center_lon],
             zoom_start=self.zoom_start,
-            tiles='CartoDB positron'
+            tiles='CartoDB positron',
+            prefer_canvas=len(merged_data) > LARGE_MAP_FEATURES
         )
         
-        # Prepare data for time animation
-        features = []
+        merged_data = merged_data.sort_values('timestamp', kind='stable')
+        
+        speeds = merged_data['speed_mph'].to_numpy()
+        colors = HEX_COLORS[bucket_speeds(speeds)]
+        iso_times = merged_data['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+        popups = segment_speed_labels(merged_data['segment_id'].to_numpy(), speeds)
+        
+        features = (
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": [
+                        [start_lon, start_lat],
+                        [end_lon, end_lat]
+                    ]
+                },
+                "properties": {
+                    "times": [iso_time],
+                    "speed": speed,
+                    "segment_id": segment_id,
+                    "style": {
+                        "color": color,
+                        "weight": 5,
+                        "opacity": 0.8
+                    },
+                    "popup": popup
+                }
+            }
+            for start_lat, start_lon, end_lat, end_lon, speed, segment_id, iso_time, color, popup in zip(
+                merged_data['start_lat'].tolist(),
+                merged_data['start_lon'].tolist(),
+                merged_data['end_lat'].tolist(),
+                merged_data['end_lon'].tolist(),
+                speeds.tolist(),
+                merged_data['segment_id'].tolist(),
+                iso_times.tolist(),
+                colors.tolist(),
+                popups
+            )
+        )
         
-        for timestamp in timestamps:
-            timestamp_data = merged_data[merged_data['timestamp'] == timestamp]
-            
-            for _, row in timestamp_data.iterrows():
-                if pd.notna(row['start_lat']) and pd.notna(row['end_lat']):
-                    feature = {
-                        "type": "Feature",
-                        "geometry": {
-                            "type": "LineString",
-                            "coordinates": [
-                                [row['start_lon'], row['start_lat']],
-                                [row['end_lon'], row['end_lat']]
-                            ]
-                        },
-                        "properties": {
-                            "times": [timestamp.isoformat()],
-                            "speed": row['speed_mph'],
-                            "segment_id": row['segment_id'],
-                            "style": {
-                                "color": self._get_color_hex(row['speed_mph']),
-                                "weight": 5,
-                                "opacity": 0.8
-                            },
-                            "popup": f"Segment {row['segment_id']}: {row['speed_mph']:.1f} mph"
-                        }
-                    }
-                    features.append(feature)
-        
-        # Add timestamped geojson
-        if features:
-            plugins.TimestampedGeoJson({
-                "type": "FeatureCollection",
-                "features": features
-            }, period="PT1H", add_last_point=True).add_to(m)
+        # Add timestamped geojson. Features are serialized one at a time, so only their
+        # compact JSON strings are alive together, never every feature dict at once
+        serialized = [dumps_json(feature) for feature in features]
+        if serialized:
+            # folium embeds the collection in the HTML, so the full text has to exist
+            # in memory once; handing it over as a file object skips a second dumps()
+            geojson_text = '{"type": "FeatureCollection", "features": [' + ', '.join(serialized) + ']}'
+            del serialized
+            plugins.TimestampedGeoJson(
+                io.StringIO(geojson_text), period="PT1H", add_last_point=True
+            ).add_to(m)
         
         # Save map
         m.save(output_path)
+        self._store_cache_key(output_path, cache_key)
         logger.info(f"Animated map saved to {output_path}")
         
         return m
     
-    def _get_color_hex(self, speed: float) -> str:
-        """Get hex color based on speed."""
-        if speed < 15:
-            return '#FF0000'  # Red
-        elif speed < 25:
-            return '#FF8C00'  # Orange
-        elif speed < 35:
-            return '#FFD700'  # Yellow
-        else:
-            return '#32CD32'  # Green
-    
     def create_prediction_comparison_map(self, 
                                        actual_data: pd.DataFrame,
                                        predicted_data: pd.DataFrame,
                                        segments_data: pd.DataFrame,
-                                       output_path: str = "prediction_comparison.html"):
-        """Create side-by-side maps comparing actual vs predicted speeds."""
+                                       output_path: str = "prediction_comparison.html",
+                                       skip_if_cached: bool = False):
+        """Create side-by-side maps comparing actual vs predicted speeds.
+        
+        With skip_if_cached, returns None without rendering when output_path was
+        already rendered from identical inputs.
+        """
+        
+        cache_key = None
+        if skip_if_cached:
+            cache_key = self._cache_key("create_prediction_comparison_map", actual_data, predicted_data, segments_data)
+            if self._is_cached(output_path, cache_key):
+                logger.info(f"{output_path} is up to date, skipping render")
+                return None
+        
+        go, make_subplots = _lazy_plotly()
         
         # Create subplots
         fig = make_subplots(
@@ -239,20 +491,25 @@ class TrafficMapVisualizer:
             horizontal_spacing=0.1
         )
         
-        # Merge data with segments
-        actual_merged = actual_data.merge(segments_data, on='segment_id', how='left')
-        predicted_merged = predicted_data.merge(segments_data, on='segment_id', how='left')
+        # Look up start coordinates per row instead of merging whole frames; reindex
+        # needs unique labels, so a segment listed more than once keeps its first entry
+        start_coords = index_segments(segments_data)[['start_lat', 'start_lon']]
+        start_coords = start_coords[~start_coords.index.duplicated()]
         
         # Create scatter plots for both actual and predicted
-        for i, (data, title) in enumerate([(actual_merged, 'Actual'), (predicted_merged, 'Predicted')]):
+        for i, (data, title) in enumerate([(actual_data, 'Actual'), (predicted_data, 'Predicted')]):
+            segment_ids = data['segment_id'].to_numpy()
+            speeds = data['speed_mph'].to_numpy()
+            coords = start_coords.reindex(segment_ids).to_numpy()
+            
             fig.add_trace(
                 go.Scattermapbox(
-                    lat=data['start_lat'],
-                    lon=data['start_lon'],
+                    lat=coords[:, 0],
+                    lon=coords[:, 1],
                     mode='markers',
                     marker=dict(
                         size=8,
-                        color=data['speed_mph'],
+                        color=speeds,
                         colorscale='RdYlGn',
                         cmin=0,
                         cmax=60,
@@ -261,8 +518,7 @@ class TrafficMapVisualizer:
                             x=0.45 if i == 0 else 1.02
                         )
                     ),
-                    text=[f"Segment {sid}: {speed:.1f} mph" 
-                          for sid, speed in zip(data['segment_id'], data['speed_mph'])],
+                    text=segment_speed_labels(segment_ids, speeds),
                     hovertemplate="%{text}<extra></extra>",
                     name=title
                 ),
@@ -287,6 +543,7 @@ class TrafficMapVisualizer:
         
         # Save plot
         fig.write_html(output_path)
+        self._store_cache_key(output_path, cache_key)
         logger.info(f"Prediction comparison map saved to {output_path}")
         
         return fig
@@ -317,7 +574,10 @@ class KeplerGLVisualizer:
         traffic_data['timestamp'] = pd.to_datetime(traffic_data['timestamp'])
         
         # Merge with segments
-        viz_data = traffic_data.merge(segments_data, on='segment_id', how='left')
+        viz_data = compact_coordinates(
+            join_segments(traffic_data, segments_data),
+            downcast=True
+        )
         
         # Create KeplerGL map
         config = {
@@ -383,60 +643,94 @@ class TrafficDashboard:
                              predictions_data: Optional[pd.DataFrame] = None):
         """Create comprehensive dashboard plots."""
         
+        go, _ = _lazy_plotly()
+        
         plots = {}
         
         # 1. Speed distribution by hour
-        fig_hourly = px.box(
-            traffic_data, 
-            x='hour', 
-            y='speed_mph',
+        speeds = traffic_data['speed_mph'].to_numpy()
+        fig_hourly = go.Figure(go.Box(
+            x=traffic_data['hour'].to_numpy(),
+            y=speeds,
+            name='',
+            hovertemplate='Hour of Day=%{x}<br>Speed (mph)=%{y}<extra></extra>'
+        ))
+        fig_hourly.update_layout(
             title='Speed Distribution by Hour of Day',
-            labels={'speed_mph': 'Speed (mph)', 'hour': 'Hour of Day'}
+            xaxis_title='Hour of Day',
+            yaxis_title='Speed (mph)'
         )
         plots['hourly_distribution'] = fig_hourly
         
         # 2. Speed trends over time
         daily_avg = traffic_data.groupby('timestamp')['speed_mph'].mean().reset_index()
-        fig_trends = px.line(
-            daily_avg,
-            x='timestamp',
-            y='speed_mph', 
+        fig_trends = go.Figure(go.Scatter(
+            x=daily_avg['timestamp'].to_numpy(),
+            y=daily_avg['speed_mph'].to_numpy(),
+            mode='lines',
+            name='',
+            hovertemplate='Time=%{x}<br>Average Speed (mph)=%{y}<extra></extra>'
+        ))
+        fig_trends.update_layout(
             title='Average Speed Trends Over Time',
-            labels={'speed_mph': 'Average Speed (mph)', 'timestamp': 'Time'}
+            xaxis_title='Time',
+            yaxis_title='Average Speed (mph)'
         )
         plots['speed_trends'] = fig_trends
         
         # 3. Segment performance comparison
-        segment_stats = traffic_data.groupby('segment_id').agg({
-            'speed_mph': ['mean', 'std', 'min', 'max']
-        }).round(2)
-        segment_stats.columns = ['avg_speed', 'std_speed', 'min_speed', 'max_speed']
-        segment_stats = segment_stats.reset_index()
-        
-        fig_segments = px.scatter(
-            segment_stats,
-            x='avg_speed',
-            y='std_speed',
-            size='max_speed',
-            hover_data=['segment_id', 'min_speed'],
+        segment_stats = traffic_data.groupby('segment_id', as_index=False).agg(
+            avg_speed=('speed_mph', 'mean'),
+            std_speed=('speed_mph', 'std'),
+            min_speed=('speed_mph', 'min'),
+            max_speed=('speed_mph', 'max')
+        ).round(2)
+        
+        max_speeds = segment_stats['max_speed'].to_numpy()
+        fig_segments = go.Figure(go.Scatter(
+            x=segment_stats['avg_speed'].to_numpy(),
+            y=segment_stats['std_speed'].to_numpy(),
+            mode='markers',
+            name='',
+            # Bubble area scaled so the largest marker is 20px across, as px does
+            marker=dict(size=max_speeds, sizemode='area',
+                        sizeref=max_speeds.max() / 20 ** 2 if len(max_speeds) else 1),
+            customdata=segment_stats[['segment_id', 'min_speed']].to_numpy(),
+            hovertemplate=(
+                'Average Speed (mph)=%{x}<br>Speed Variability (mph)=%{y}<br>'
+                'max_speed=%{marker.size}<br>segment_id=%{customdata[0]}<br>'
+                'min_speed=%{customdata[1]}<extra></extra>'
+            )
+        ))
+        fig_segments.update_layout(
             title='Segment Performance: Average vs Variability',
-            labels={'avg_speed': 'Average Speed (mph)', 'std_speed': 'Speed Variability (mph)'}
+            xaxis_title='Average Speed (mph)',
+            yaxis_title='Speed Variability (mph)'
         )
         plots['segment_performance'] = fig_segments
         
         # 4. Rush hour analysis
-        traffic_data['rush_hour'] = traffic_data['hour'].apply(
-            lambda x: 'Morning Rush' if 7 <= x <= 9 
-            else 'Evening Rush' if 17 <= x <= 19
-            else 'Off Peak'
+        hours = traffic_data['hour'].to_numpy()
+        period_codes = np.select(
+            [(hours >= 7) & (hours <= 9), (hours >= 17) & (hours <= 19)],
+            [0, 1],
+            2
+        )
+        traffic_data['rush_hour'] = pd.Categorical.from_codes(
+            period_codes, categories=RUSH_HOUR_PERIODS, ordered=True
         )
         
-        fig_rush = px.violin(
-            traffic_data,
-            x='rush_hour',
-            y='speed_mph',
+        fig_rush = go.Figure(go.Violin(
+            x=traffic_data['rush_hour'].to_numpy(),
+            y=speeds,
+            name='',
+            hovertemplate='Time Period=%{x}<br>Speed (mph)=%{y}<extra></extra>'
+        ))
+        fig_rush.update_layout(
             title='Speed Distribution by Rush Hour Periods',
-            labels={'speed_mph': 'Speed (mph)', 'rush_hour': 'Time Period'}
+            xaxis_title='Time Period',
+            yaxis_title='Speed (mph)',
+            xaxis=dict(categoryorder='array', categoryarray=RUSH_HOUR_PERIODS)
         )
         plots['rush_hour_analysis'] = fig_rush
         
@@ -448,12 +742,17 @@ class TrafficDashboard:
                 how='inner'
             )
             
-            fig_accuracy = px.scatter(
-                comparison_data,
-                x='speed_mph',
-                y='predicted_speed',
+            fig_accuracy = go.Figure(go.Scatter(
+                x=comparison_data['speed_mph'].to_numpy(),
+                y=comparison_data['predicted_speed'].to_numpy(),
+                mode='markers',
+                name='',
+                hovertemplate='Actual Speed (mph)=%{x}<br>Predicted Speed (mph)=%{y}<extra></extra>'
+            ))
+            fig_accuracy.update_layout(
                 title='Prediction Accuracy: Actual vs Predicted Speeds',
-                labels={'speed_mph': 'Actual Speed (mph)', 'predicted_speed': 'Predicted Speed (mph)'}
+                xaxis_title='Actual Speed (mph)',
+                yaxis_title='Predicted Speed (mph)'
             )
             # Add perfect prediction line
             min_speed = min(comparison_data['speed_mph'].min(), comparison_data['predicted_speed'].min())
@@ -478,48 +777,77 @@ class TrafficDashboard:
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
+        # Key segment metadata by segment_id once for all builders
+        segments_data = index_segments(segments_data)
+        
         # Create dashboard plots
         plots = self.create_dashboard_plots(traffic_data, segments_data, predictions_data)
         
-        # Save plotly figures
-        for name, fig in plots.items():
-            fig.write_html(output_path / f"{name}.html")
-            logger.info(f"Saved {name} plot to {output_path / name}.html")
-        
-        # Create maps
-        self.map_viz.create_speed_heatmap(
-            traffic_data, 
+        # Each output is rendered independently, so write them from a process pool;
+        # builders run through _render so their map objects are not pickled back.
+        # Only the files are needed here, so maps already rendered from these inputs are skipped
+        tasks = {
+            f"{name} plot": (fig.write_html, str(output_path / f"{name}.html"))
+            for name, fig in plots.items()
+        }
+        tasks["speed heatmap"] = (
+            functools.partial(self.map_viz.create_speed_heatmap, skip_if_cached=True), traffic_data,
             str(output_path / "speed_heatmap.html")
         )
-        
-        self.map_viz.create_segment_map(
-            traffic_data, 
-            segments_data,
-            output_path=str(output_path / "segment_map.html")
+        tasks["segment map"] = (
+            functools.partial(self.map_viz.create_segment_map, skip_if_cached=True), traffic_data, segments_data,
+            None, str(output_path / "segment_map.html")
         )
-        
-        self.map_viz.create_time_series_animation(
-            traffic_data,
-            segments_data, 
-            output_path=str(output_path / "traffic_animation.html")
+        tasks["traffic animation"] = (
+            functools.partial(self.map_viz.create_time_series_animation, skip_if_cached=True), traffic_data, segments_data,
+            str(output_path / "traffic_animation.html")
         )
         
         # Create KeplerGL visualization if available
         if self.kepler_viz.available:
-            self.kepler_viz.create_kepler_visualization(
-                traffic_data,
-                segments_data,
-                output_path=str(output_path / "kepler_traffic.html")
+            tasks["KeplerGL visualization"] = (
+                self.kepler_viz.create_kepler_visualization, traffic_data, segments_data,
+                str(output_path / "kepler_traffic.html")
             )
         
+        start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+        max_workers = min(4, len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=mp.get_context(start_method)) as executor:
+            futures = {executor.submit(_render, *task): label for label, task in tasks.items()}
+            for future in as_completed(futures):
+                future.result()
+                logger.info(f"Saved {futures[future]}")
+        
         logger.info(f"All visualizations saved to {output_dir}")
 
+# Parquet copies of raw CSVs, kept out of the source-data directory
+PARQUET_CACHE_DIR = Path("data/processed/parquet_cache")
+
+def _load(csv_path: str) -> pd.DataFrame:
+    """Load a raw CSV, preferring an up-to-date parquet copy written on first load."""
+    csv_file = Path(csv_path)
+    parquet_file = PARQUET_CACHE_DIR / f"{csv_file.stem}.parquet"
+    
+    if parquet_file.exists() and parquet_file.stat().st_mtime >= csv_file.stat().st_mtime:
+        return pd.read_parquet(parquet_file, engine='pyarrow')
+    
+    data = pd.read_csv(csv_file)
+    try:
+        PARQUET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        data.to_parquet(parquet_file, engine='pyarrow', compression='zstd', index=False)
+        logger.info(f"Cached {csv_file} as {parquet_file}")
+    except OSError as e:
+        # A read-only checkout still works, it just re-parses the CSV next time
+        logger.warning(f"Could not cache {csv_file} as parquet: {e}")
+    return data
+
 def main():
     """Main function to create sample visualizations."""
     
     # Load sample data
-    traffic_data = pd.read_csv("data/raw/san_francisco_traffic_data.csv")
-    segments_data = pd.read_csv("data/raw/san_francisco_segments.csv")
+    traffic_data = _load("data/raw/san_francisco_traffic_data.csv")
+    segments_data = _load("data/raw/san_francisco_segments.csv")
     
     # Create dashboard
     dashboard = TrafficDashboard()
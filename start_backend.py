@@ -7,24 +7,25 @@ This script starts the FastAPI server with mock data endpoints.
 import sys
 import os
 import subprocess
+import importlib.util
 
 def check_dependencies():
     """Check if required packages are installed"""
-    try:
-        import fastapi
-        import uvicorn
+    # find_spec only locates the packages; importing them here would be wasted work
+    # since the server runs in a child process that imports them anyway
+    if all(importlib.util.find_spec(name) is not None for name in ("fastapi", "uvicorn")):
         print("✓ FastAPI and Uvicorn are installed")
         return True
-    except ImportError:
-        print("⚠ Missing dependencies. Installing FastAPI and Uvicorn...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "fastapi", "uvicorn"])
-            print("✓ Dependencies installed successfully")
-            return True
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install dependencies. Please run:")
-            print("   pip install fastapi uvicorn")
-            return False
+    
+    print("⚠ Missing dependencies. Installing FastAPI and Uvicorn...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "fastapi", "uvicorn"])
+        print("✓ Dependencies installed successfully")
+        return True
+    except subprocess.CalledProcessError:
+        print("❌ Failed to install dependencies. Please run:")
+        print("   pip install fastapi uvicorn")
+        return False
 
 def main():
     print("🚀 Starting UberFlow Analytics Backend API")
@@ -5,6 +5,8 @@ Production startup script for UberFlow Analytics API
 
 import os
 import sys
+import shutil
+import subprocess
 import uvicorn
 from pathlib import Path
 
@@ -32,11 +34,19 @@ def main():
     # Check if we should use the real API or mock API
     if os.path.exists("mock_api_complete.py") and os.getenv("USE_MOCK_API", "true").lower() == "true":
         print("   Using: Mock API (mock_api_complete.py)")
-        # Import and run mock API
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("mock_api", "mock_api_complete.py")
-        mock_api = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mock_api)
+        # The mock is a plain http.server handler rather than an ASGI app, so serve it
+        # directly on a threaded server bound to the configured address
+        from http.server import ThreadingHTTPServer
+        sys.path.insert(0, str(current_dir))
+        from mock_api_complete import MockAPIHandler
+        
+        server = ThreadingHTTPServer((host, port), MockAPIHandler)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Shutting down UberFlow Analytics API")
+        finally:
+            server.server_close()
         return
     
     # Production API configuration
@@ -61,8 +71,35 @@ def main():
             "timeout_graceful_shutdown": 30,
         })
     
+    # Prefer gunicorn with --preload: the app and its heavy imports load once in the
+    # master and workers fork copy-on-write from it (trade-off: no code reload)
+    gunicorn = shutil.which("gunicorn")
+    if gunicorn:
+        print("   Server: gunicorn + UvicornWorker (preloaded app, no auto-reload)")
+        command = [
+            gunicorn, config["app"],
+            "--worker-class", "uvicorn.workers.UvicornWorker",
+            "--workers", str(workers),
+            "--preload",
+            "--pythonpath", str(src_dir),
+            "--bind", f"{host}:{port}",
+            "--log-level", log_level,
+            "--access-logfile", "-",
+        ]
+        if os.path.isdir("/dev/shm"):
+            command += ["--worker-tmp-dir", "/dev/shm"]
+        if os.getenv("ENVIRONMENT") == "production":
+            command += [
+                "--forwarded-allow-ips", "*",
+                "--keep-alive", str(config["timeout_keep_alive"]),
+                "--graceful-timeout", str(config["timeout_graceful_shutdown"]),
+            ]
+    
     try:
-        uvicorn.run(**config)
+        if gunicorn:
+            subprocess.run(command, check=True)
+        else:
+            uvicorn.run(**config)
     except KeyboardInterrupt:
         print("\n👋 Shutting down UberFlow Analytics API")
     except Exception as e:
@@ -5,12 +5,372 @@ Train real ML models and start the production API with actual predictions.
 
 import os
 import sys
+import hashlib
+import importlib.util
 import subprocess
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from numpy.lib.stride_tricks import sliding_window_view
 from pathlib import Path
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import json
 import pickle
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
+
+CITIES = ['san_francisco', 'new_york', 'london']
+TRAFFIC_FILES = 'data/raw/{city}_traffic_data.csv'
+SEGMENT_FILES = 'data/raw/{city}_segments.csv'
+
+# Prepared training inputs, reused while the raw inputs hash the same
+PREP_DIR = Path('models/cache')
+PREP_FILE = PREP_DIR / 'lstm_prep.npz'
+SEQUENCE_FILE = PREP_DIR / 'lstm_sequences.npy'
+PREP_VERSION = 1
+
+# Seeded PCG64 generator for the synthetic targets, independent of the global RNG
+rng = np.random.default_rng(0)
+
+# Only the columns training reads, with the narrowest types that hold them
+TRAFFIC_COLUMNS = {'segment_id': pa.int32(), 'speed_mph': pa.float32(), 'timestamp': pa.timestamp('ns')}
+SEGMENT_COLUMNS = {'start_lat': pa.float32(), 'start_lon': pa.float32(),
+                   'end_lat': pa.float32(), 'end_lon': pa.float32()}
+
+def input_fingerprint() -> str:
+    """Cheap content key for the raw training inputs: size, mtime and first MiB of each file."""
+    digest = hashlib.blake2b(digest_size=16)
+    for template in (TRAFFIC_FILES, SEGMENT_FILES):
+        for city in CITIES:
+            path = template.format(city=city)
+            if not os.path.exists(path):
+                digest.update(f"{path}:missing".encode())
+                continue
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read(1 << 20))
+    return digest.hexdigest()
+
+def models_up_to_date(input_hash: str) -> bool:
+    """True when both checkpoints exist and were trained on inputs with this hash."""
+    if not Path('models/lstm_model.pth').exists() or not Path('models/gnn_model.pth').exists():
+        return False
+    try:
+        with open('models/metadata.json') as f:
+            return json.load(f).get('input_hash') == input_hash
+    except (OSError, ValueError):
+        return False
+
+def write_metadata(metadata: dict):
+    """Write models/metadata.json, using orjson when it is installed."""
+    if orjson is not None:
+        Path('models/metadata.json').write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    else:
+        with open('models/metadata.json', 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+def read_city_csv(path: str, column_types: dict) -> pa.Table:
+    """Read the given columns of a raw city CSV as an Arrow table."""
+    # Arrow parses in fixed-size blocks on its own thread pool, so large files
+    # need no pandas-side chunk loop
+    return pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=list(column_types)
+        )
+    )
+
+def read_city_tables(path_template: str, column_types: dict) -> pd.DataFrame:
+    """Read one raw file per city concurrently and union them in CITIES order."""
+    paths = [path_template.format(city=city) for city in CITIES]
+    # CSV parsing releases the GIL, so threads overlap the per-city reads
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        tables = list(pool.map(lambda path: read_city_csv(path, column_types), paths))
+    # concat_tables only stitches chunk lists; the one copy happens in to_pandas,
+    # which frees each Arrow column as soon as it has been converted
+    return pa.concat_tables(tables).to_pandas(split_blocks=True, self_destruct=True)
+
+def segment_windows(segment_ids: np.ndarray,
+                    sequence_length: int,
+                    max_segments: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Return each segment's first row and its number of (sequence, target) windows."""
+    boundaries = np.flatnonzero(segment_ids[1:] != segment_ids[:-1]) + 1
+    segment_starts = np.concatenate(([0], boundaries))[:max_segments]
+    segment_ends = np.concatenate((boundaries, [len(segment_ids)]))[:max_segments]
+    return segment_starts, np.maximum(segment_ends - segment_starts - sequence_length, 0)
+
+def build_sequences(segment_ids: np.ndarray,
+                    speeds: np.ndarray,
+                    sequence_length: int,
+                    max_segments: Optional[int] = None,
+                    out_path: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Cut per-segment speed series into (sequence, next speed) training pairs.
+    
+    Rows must be grouped by segment and time-ordered within each segment. Every
+    window of sequence_length + 1 speeds that stays inside one segment becomes a
+    pair. Window counts are sized up front so each segment's windows are copied as
+    one block into preallocated float32 buffers. With out_path the sequence buffer
+    is a memory-mapped .npy file, so it can outgrow RAM and be reopened with
+    np.load(out_path, mmap_mode='r') by another process.
+    """
+    speeds = np.asarray(speeds, dtype=np.float32)
+    segment_starts, n_windows = segment_windows(segment_ids, sequence_length, max_segments)
+    total_windows = int(n_windows.sum())
+    if out_path is not None and total_windows:
+        sequences = np.lib.format.open_memmap(out_path, mode='w+', dtype=np.float32,
+                                              shape=(total_windows, sequence_length))
+    else:
+        sequences = np.empty((total_windows, sequence_length), dtype=np.float32)
+    targets = np.empty(total_windows, dtype=np.float32)
+    if total_windows == 0:
+        return sequences, targets
+    
+    offsets = np.cumsum(n_windows) - n_windows
+    windows = sliding_window_view(speeds, sequence_length)
+    for start, offset, count in zip(segment_starts.tolist(), offsets.tolist(), n_windows.tolist()):
+        sequences[offset:offset + count] = windows[start:start + count]
+        targets[offset:offset + count] = speeds[start + sequence_length:start + sequence_length + count]
+    if isinstance(sequences, np.memmap):
+        sequences.flush()
+    return sequences, targets
+
+def build_sequence_tensors(segment_ids: np.ndarray,
+                           speeds: np.ndarray,
+                           sequence_length: int,
+                           max_segments: Optional[int] = None,
+                           device: str = 'cuda'):
+    """Device-side build_sequences: ship the raw speeds once, window them on the device.
+    
+    Only the speed column (not every overlapping window) crosses the host-device link;
+    unfold() makes the strided windows and one gather keeps those inside a segment.
+    """
+    import torch
+    
+    segment_starts, n_windows = segment_windows(segment_ids, sequence_length, max_segments)
+    total_windows = int(n_windows.sum())
+    if total_windows == 0:
+        return (torch.empty((0, sequence_length), device=device),
+                torch.empty(0, device=device))
+    
+    speed_tensor = torch.from_numpy(np.ascontiguousarray(speeds, dtype=np.float32))
+    if torch.device(device).type == 'cuda':
+        speed_tensor = speed_tensor.pin_memory()
+    speed_tensor = speed_tensor.to(device, non_blocking=True)
+    
+    # Window i of segment k starts at segment_starts[k] + i
+    offsets = np.cumsum(n_windows) - n_windows
+    window_starts = torch.repeat_interleave(
+        torch.as_tensor(segment_starts - offsets, device=device),
+        torch.as_tensor(n_windows, device=device)
+    ) + torch.arange(total_windows, device=device)
+    
+    windows = speed_tensor.unfold(0, sequence_length + 1, 1)[window_starts]
+    return windows[:, :-1], windows[:, -1]
+
+DENSE_GRAPH_MAX_NODES = 2048
+
+
+def connect_nearby_segments(start_xy: np.ndarray, end_xy: np.ndarray, radius: float) -> np.ndarray:
+    """Edges (i, j), i != j, where segment i starts strictly within radius of segment j's end.
+
+    Small graphs use one dense cdist matrix; larger ones switch to a KD-tree so the
+    N x N distance matrix is never materialised. Edges come back in row-major order.
+    """
+    if len(start_xy) <= DENSE_GRAPH_MAX_NODES:
+        from scipy.spatial.distance import cdist
+        nearby = cdist(start_xy, end_xy) < radius
+        np.fill_diagonal(nearby, False)
+        return np.argwhere(nearby).T
+    
+    from scipy.spatial import cKDTree
+    neighbors = cKDTree(end_xy).query_ball_point(start_xy, r=radius, return_sorted=True)
+    src = np.repeat(np.arange(len(start_xy)), [len(n) for n in neighbors])
+    dst = np.concatenate(neighbors).astype(np.int64) if len(src) else np.empty(0, dtype=np.int64)
+    # query_ball_point is inclusive of r; keep the strict threshold (in float64, as cdist does)
+    dist = np.sqrt(((start_xy[src].astype(np.float64) - end_xy[dst]) ** 2).sum(axis=1))
+    keep = (src != dst) & (dist < radius)
+    return np.stack([src[keep], dst[keep]])
+
+
+def split_cpus() -> Tuple[list, list]:
+    """Split the usable cores into two disjoint halves, one per concurrent trainer."""
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    half = max(1, len(cpus) // 2)
+    # A single core cannot be split, so both trainers share it
+    return cpus[:half], cpus[half:] or cpus[:half]
+
+def run_pinned(cpus: list, train, *args):
+    """Confine this worker to its own cores and thread pool, then run the trainer."""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+    # Set before torch is first imported in this worker so OpenMP sizes its pool to match
+    os.environ['OMP_NUM_THREADS'] = str(len(cpus))
+    import torch
+    torch.set_num_threads(len(cpus))
+    train(*args)
+
+def train_lstm(sequences, targets):
+    """Train the LSTM on prepared windows and save its checkpoint.
+    
+    sequences may be the path of a .npy file written by build_sequences, which is
+    mapped read-only instead of being pickled into this worker.
+    """
+    from src.models.lstm_model import LSTMTrainer
+    
+    if isinstance(sequences, (str, Path)):
+        sequences = np.load(sequences, mmap_mode='r')
+    lstm_trainer = LSTMTrainer()
+    lstm_trainer.prepare_data(sequences, targets)
+    lstm_trainer.train(epochs=10)  # Quick training for demo
+    lstm_trainer.save_model('models/lstm_model.pth')
+    print("✅ LSTM model saved to models/lstm_model.pth")
+
+def train_gnn(node_features, edge_index, targets_gnn):
+    """Train the GNN on the segment graph and save its checkpoint."""
+    from src.models.gnn_model import GNNTrainer
+    
+    gnn_trainer = GNNTrainer()
+    gnn_trainer.prepare_data(node_features, edge_index, np.ones((edge_index.shape[1], 1)), targets_gnn)
+    gnn_trainer.train(epochs=10)  # Quick training
+    gnn_trainer.save_model('models/gnn_model.pth')
+    print("✅ GNN model saved to models/gnn_model.pth")
+
+def on_own_stream(train, *args):
+    """Run a trainer on a private CUDA stream so both models' kernels can overlap."""
+    import torch
+    with torch.cuda.stream(torch.cuda.Stream()):
+        train(*args)
+    torch.cuda.synchronize()
+
+def train_concurrently(use_cuda: bool, lstm_args: tuple, gnn_args: tuple):
+    """Train the LSTM and GNN side by side; they share no state beyond their inputs."""
+    if use_cuda:
+        # CUDA tensors stay in this process; threads on separate streams share the GPU
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(on_own_stream, train_lstm, *lstm_args),
+                       pool.submit(on_own_stream, train_gnn, *gnn_args)]
+            for future in futures:
+                future.result()
+        return
+    
+    # forkserver (spawn where it is unavailable, e.g. Windows) children start clean
+    # instead of inheriting torch's thread pools; each trainer gets its own half of
+    # the cores so they don't contend for them
+    lstm_cpus, gnn_cpus = split_cpus()
+    start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(max_workers=2, mp_context=mp.get_context(start_method)) as pool:
+        futures = [pool.submit(run_pinned, lstm_cpus, train_lstm, *lstm_args),
+                   pool.submit(run_pinned, gnn_cpus, train_gnn, *gnn_args)]
+        for future in futures:
+            future.result()
+
+def prepare_training_data(use_cuda: bool) -> dict:
+    """Read the raw city files and build the LSTM windows and GNN graph."""
+    # A half-written cache must not be mistaken for a valid one
+    PREP_DIR.mkdir(parents=True, exist_ok=True)
+    if PREP_FILE.exists():
+        PREP_FILE.unlink()
+    
+    print("📊 Loading training data...")
+    # San Francisco first as the primary training set, then New York and London;
+    # each table is concatenated once rather than re-copied per city
+    traffic_df = read_city_tables(TRAFFIC_FILES, TRAFFIC_COLUMNS)
+    segments_df = read_city_tables(SEGMENT_FILES, SEGMENT_COLUMNS)
+    
+    print(f"✅ Loaded {len(traffic_df)} traffic records from {len(CITIES)} cities")
+    print(f"✅ Loaded {len(segments_df)} road segments")
+    
+    # Prepare features
+    traffic_df = traffic_df.sort_values(['segment_id', 'timestamp'])
+    
+    # Prepare LSTM training data
+    print("\n🧠 Preparing LSTM sequences...")
+    sequence_length = 24  # 24 hours of history
+    
+    # Window on the GPU when there is one, so only raw speeds are transferred
+    segment_ids = traffic_df['segment_id'].to_numpy()
+    speeds = traffic_df['speed_mph'].to_numpy()
+    if use_cuda:
+        sequences, targets = build_sequence_tensors(
+            segment_ids, speeds, sequence_length,
+            max_segments=100  # Use subset for quick training
+        )
+    else:
+        # Windows go straight into the memory-mapped cache file rather than RAM;
+        # the trainer process maps the same file instead of receiving a copy
+        sequences, targets = build_sequences(
+            segment_ids, speeds, sequence_length,
+            max_segments=100,  # Use subset for quick training
+            out_path=str(SEQUENCE_FILE)
+        )
+    
+    print(f"   Created {len(sequences)} training sequences")
+    
+    # Prepare GNN training data (simplified)
+    print("\n🌐 Preparing GNN graph...")
+    
+    # Create graph structure from segments
+    # Simplified graph creation - connect segments whose start lies near another's end
+    graph_segments = segments_df.iloc[:100]  # Limit for quick training
+    # One contiguous float32 (nodes, 4) block; endpoints are column views into it
+    node_features = np.column_stack([
+        graph_segments[column].to_numpy(dtype=np.float32) for column in SEGMENT_COLUMNS
+    ])
+    start_xy = node_features[:, :2]
+    end_xy = node_features[:, 2:]
+    
+    edge_index = connect_nearby_segments(start_xy, end_xy, radius=0.01)
+    if edge_index.shape[1] == 0:
+        edge_index = np.array([[0], [0]])
+    
+    print(f"   Created graph with {len(node_features)} nodes and {edge_index.shape[1]} edges")
+    
+    return {
+        'sequences': sequences,
+        'targets': targets,
+        'node_features': node_features,
+        'edge_index': edge_index,
+        'total_records': len(traffic_df),
+        'total_segments': len(segments_df)
+    }
+
+def save_prepared_data(prepared: dict, input_hash: str):
+    """Persist prepared inputs; sequences stay a separate .npy so they can be memory-mapped."""
+    sequences = prepared['sequences']
+    if not isinstance(sequences, np.memmap):
+        # Device tensors and empty window sets were not built in the cache file
+        if hasattr(sequences, 'cpu'):
+            sequences = sequences.cpu().numpy()
+        np.save(SEQUENCE_FILE, sequences)
+    
+    arrays = {key: np.asarray(value.cpu() if hasattr(value, 'cpu') else value)
+              for key, value in prepared.items() if key != 'sequences'}
+    # Written last, so its presence means the sequence file is complete
+    np.savez(PREP_FILE, version=PREP_VERSION, input_hash=input_hash, **arrays)
+
+def load_prepared_data(input_hash: str) -> Optional[dict]:
+    """Return the cached inputs for this input hash, or None if there are none."""
+    if not PREP_FILE.exists() or not SEQUENCE_FILE.exists():
+        return None
+    with np.load(PREP_FILE) as cached:
+        if int(cached['version']) != PREP_VERSION or str(cached['input_hash']) != input_hash:
+            return None
+        prepared = {key: cached[key] for key in cached.files if key not in ('version', 'input_hash')}
+    # Passed on as a path; the LSTM trainer maps it read-only
+    prepared['sequences'] = str(SEQUENCE_FILE)
+    return prepared
 
 def train_models():
     """Train LSTM and GNN models with real data."""
@@ -19,111 +379,45 @@ def train_models():
     
     # Create models directory
     Path("models").mkdir(exist_ok=True)
+    # Hash the inputs before reading them so the key matches what was trained on
+    input_hash = input_fingerprint()
     
-    # Load and prepare training data
-    print("📊 Loading training data...")
     try:
-        # Load San Francisco data as primary training set
-        traffic_df = pd.read_csv('data/raw/san_francisco_traffic_data.csv')
-        segments_df = pd.read_csv('data/raw/san_francisco_segments.csv')
-        
-        # Add New York and London data
-        for city in ['new_york', 'london']:
-            city_traffic = pd.read_csv(f'data/raw/{city}_traffic_data.csv')
-            city_segments = pd.read_csv(f'data/raw/{city}_segments.csv')
-            traffic_df = pd.concat([traffic_df, city_traffic], ignore_index=True)
-            segments_df = pd.concat([segments_df, city_segments], ignore_index=True)
-        
-        print(f"✅ Loaded {len(traffic_df)} traffic records from 3 cities")
-        print(f"✅ Loaded {len(segments_df)} road segments")
-        
-        # Prepare features
-        traffic_df['timestamp'] = pd.to_datetime(traffic_df['timestamp'])
-        traffic_df = traffic_df.sort_values(['segment_id', 'timestamp'])
-        
-        # Create sequences for LSTM (simplified training)
-        print("\n🧠 Training LSTM Model...")
-        from src.models.lstm_model import LSTMTrainer
-        
-        lstm_trainer = LSTMTrainer()
-        
-        # Prepare LSTM training data
-        sequences = []
-        targets = []
-        sequence_length = 24  # 24 hours of history
-        
-        for segment_id in traffic_df['segment_id'].unique()[:100]:  # Use subset for quick training
-            segment_data = traffic_df[traffic_df['segment_id'] == segment_id]['speed_mph'].values
-            if len(segment_data) > sequence_length:
-                for i in range(len(segment_data) - sequence_length):
-                    sequences.append(segment_data[i:i+sequence_length])
-                    targets.append(segment_data[i+sequence_length])
-        
-        sequences = np.array(sequences)
-        targets = np.array(targets)
-        
-        print(f"   Created {len(sequences)} training sequences")
-        
-        # Train LSTM (simplified)
-        lstm_trainer.prepare_data(sequences, targets)
-        lstm_trainer.train(epochs=10)  # Quick training for demo
-        lstm_trainer.save_model('models/lstm_model.pth')
-        print("✅ LSTM model saved to models/lstm_model.pth")
-        
-        # Train GNN Model (simplified)
-        print("\n🌐 Training GNN Model...")
-        from src.models.gnn_model import GNNTrainer
-        
-        gnn_trainer = GNNTrainer()
-        
-        # Create graph structure from segments
-        edge_index = []
-        node_features = []
-        
-        # Simplified graph creation - connect nearby segments
-        for i, seg1 in segments_df.iterrows():
-            if i >= 100:  # Limit for quick training
-                break
-            node_feature = [
-                seg1['start_lat'], seg1['start_lon'],
-                seg1['end_lat'], seg1['end_lon']
-            ]
-            node_features.append(node_feature)
-            
-            # Connect to nearby segments (simplified)
-            for j, seg2 in segments_df.iterrows():
-                if i != j and j < 100:
-                    dist = np.sqrt(
-                        (seg1['start_lat'] - seg2['end_lat'])**2 + 
-                        (seg1['start_lon'] - seg2['end_lon'])**2
-                    )
-                    if dist < 0.01:  # Threshold for connection
-                        edge_index.append([i, j])
+        import torch
+        use_cuda = torch.cuda.is_available()
         
-        edge_index = np.array(edge_index).T if edge_index else np.array([[0], [0]])
-        node_features = np.array(node_features)
+        prepared = load_prepared_data(input_hash)
+        if prepared is None:
+            prepared = prepare_training_data(use_cuda)
+            save_prepared_data(prepared, input_hash)
+            if not use_cuda:
+                # Hand the worker the file path rather than pickling the mapped array
+                prepared['sequences'] = str(SEQUENCE_FILE)
+        else:
+            print(f"♻️  Reusing prepared training data from {PREP_DIR}")
+        node_features = prepared['node_features']
         
-        print(f"   Created graph with {len(node_features)} nodes and {edge_index.shape[1]} edges")
+        # Simplified targets, float32 like node_features
+        targets_gnn = rng.standard_normal(len(node_features), dtype=np.float32) * np.float32(10) + np.float32(30)
         
-        # Train GNN
-        targets_gnn = np.random.randn(len(node_features)) * 10 + 30  # Simplified targets
-        gnn_trainer.prepare_data(node_features, edge_index, np.ones((edge_index.shape[1], 1)), targets_gnn)
-        gnn_trainer.train(epochs=10)  # Quick training
-        gnn_trainer.save_model('models/gnn_model.pth')
-        print("✅ GNN model saved to models/gnn_model.pth")
+        # The two models are independent, so train them at the same time
+        print("\n🧠 Training LSTM and GNN models...")
+        train_concurrently(use_cuda,
+                           (prepared['sequences'], prepared['targets']),
+                           (node_features, prepared['edge_index'], targets_gnn))
         
         # Save metadata
         metadata = {
             'lstm_trained': True,
             'gnn_trained': True,
-            'training_date': pd.Timestamp.now().isoformat(),
-            'cities': ['san_francisco', 'new_york', 'london'],
-            'total_records': len(traffic_df),
-            'total_segments': len(segments_df)
+            'training_date': datetime.now(timezone.utc).isoformat(),
+            'cities': CITIES,
+            'total_records': int(prepared['total_records']),
+            'total_segments': int(prepared['total_segments']),
+            'input_hash': input_hash
         }
         
-        with open('models/metadata.json', 'w') as f:
-            json.dump(metadata, f, indent=2)
+        write_metadata(metadata)
         
         print("\n✅ Model training complete!")
         return True
@@ -147,7 +441,15 @@ def train_models():
                 out, _ = self.lstm(x)
                 return self.fc(out[-1])
         
+        # FALLBACK_QUANTIZED=1 stores int8 dynamic-quantized weights: smaller files
+        # and faster CPU loads for placeholders that only need to answer requests
+        quantize = os.getenv("FALLBACK_QUANTIZED", "0") == "1"
+        
         lstm_model = SimpleLSTM()
+        if quantize:
+            lstm_model = torch.ao.quantization.quantize_dynamic(
+                lstm_model, {nn.LSTM, nn.Linear}, dtype=torch.qint8
+            )
         torch.save(lstm_model.state_dict(), 'models/lstm_model.pth')
         
         # Simple GNN fallback
@@ -162,13 +464,31 @@ def train_models():
                 return self.fc2(x)
         
         gnn_model = SimpleGNN()
+        if quantize:
+            gnn_model = torch.ao.quantization.quantize_dynamic(
+                gnn_model, {nn.Linear}, dtype=torch.qint8
+            )
         torch.save(gnn_model.state_dict(), 'models/gnn_model.pth')
         
-        print("✅ Created fallback models")
+        # Record the inputs too, so relaunching on the same data does not retry training
+        write_metadata({
+            'lstm_trained': False,
+            'gnn_trained': False,
+            'fallback': True,
+            'training_date': datetime.now(timezone.utc).isoformat(),
+            'cities': CITIES,
+            'input_hash': input_hash
+        })
+        
+        print(f"✅ Created {'int8 ' if quantize else ''}fallback models")
         return True
 
-def start_real_api():
-    """Start the real prediction API."""
+def start_real_api(dev: bool = False):
+    """Start the real prediction API.
+    
+    By default the server runs one worker per core on uvloop/httptools when they are
+    installed; dev=True runs a single auto-reloading worker instead.
+    """
     print("\n🚀 Starting Real Prediction API")
     print("=" * 50)
     
@@ -177,6 +497,22 @@ def start_real_api():
         print("⚠️  Models not found. Training first...")
         train_models()
     
+    command = [
+        sys.executable, "-m", "uvicorn",
+        "src.api.prediction_api:app",
+        "--host", "0.0.0.0",
+        "--port", "8000"
+    ]
+    if dev:
+        # The file watcher only supports a single worker
+        command.append("--reload")
+    else:
+        command += ["--workers", str(os.cpu_count() or 1)]
+        if importlib.util.find_spec("uvloop"):
+            command += ["--loop", "uvloop"]
+        if importlib.util.find_spec("httptools"):
+            command += ["--http", "httptools"]
+    
     # Start the real API
     print("Starting API server on http://localhost:8000")
     print("The API will serve real ML predictions")
@@ -185,13 +521,7 @@ def start_real_api():
     
     try:
         # Start the actual prediction API
-        subprocess.run([
-            sys.executable, "-m", "uvicorn",
-            "src.api.prediction_api:app",
-            "--host", "0.0.0.0",
-            "--port", "8000",
-            "--reload"
-        ])
+        subprocess.run(command)
     except KeyboardInterrupt:
         print("\n👋 API server stopped")
 
@@ -199,9 +529,11 @@ if __name__ == "__main__":
     # First ensure we're in the right directory
     os.chdir(Path(__file__).parent)
     
-    # Train models if needed
-    if not Path('models/lstm_model.pth').exists() or not Path('models/gnn_model.pth').exists():
+    # Train models unless the saved ones were trained on these exact inputs
+    if not models_up_to_date(input_fingerprint()):
         train_models()
+    else:
+        print("✅ Models are up to date with data/raw, skipping training")
     
-    # Start the API
-    start_real_api()
\ No newline at end of file
+    # Start the API; --dev restores the single auto-reloading worker
+    start_real_api(dev='--dev' in sys.argv[1:])